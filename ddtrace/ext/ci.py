@@ -3,16 +3,20 @@ Tags for common CI attributes
 """
 from collections import OrderedDict
 import json
-import logging
 import os
 import platform
 import re
 from typing import Dict
+from typing import Iterable
 from typing import MutableMapping
 from typing import Optional
+from typing import Tuple
 
 from ddtrace.ext import git
 from ddtrace.internal.logger import get_logger
+from ddtrace.internal.utils.cache import cached
+from ddtrace.internal.utils.cache import callonce
+from ddtrace.internal.utils.formats import asbool
 
 
 # CI app dd_origin tag
@@ -74,61 +78,103 @@ log = get_logger(__name__)
 
 def _filter_sensitive_info(url):
     # type: (Optional[str]) -> Optional[str]
-    return _RE_URL.sub("\\1", url) if url is not None else None
+    # Credentials can only be present in the URL if it contains "@"
+    return _RE_URL.sub("\\1", url) if url and "@" in url else url
 
 
+def _ci_env_vars_json(env_vars):
+    # type: (Iterable[Tuple[str, Optional[str]]]) -> str
+    """Serialize ``(name, value)`` environment variable pairs into a compact JSON object, preserving their order."""
+    # OrderedDict is necessary for comparing against a fixture in testing
+    return json.dumps(OrderedDict(env_vars), separators=(",", ":"))
+
+
+@callonce
 def _get_runtime_and_os_metadata():
-    """Extract configuration facet tags for OS and Python runtime."""
+    """Extract configuration facet tags for OS and Python runtime.
+
+    These values cannot change during the lifetime of the process, so they are computed only once.
+    """
+    if os.name == "posix":
+        # os.uname() is a direct system call, whereas the platform helpers go through platform.uname()
+        sysname, _, release, _, machine = os.uname()
+    else:
+        sysname, release, machine = platform.system(), platform.release(), platform.machine()
     return {
-        OS_ARCHITECTURE: platform.machine(),
-        OS_PLATFORM: platform.system(),
-        OS_VERSION: platform.release(),
+        OS_ARCHITECTURE: machine,
+        OS_PLATFORM: sysname,
+        OS_VERSION: release,
         RUNTIME_NAME: platform.python_implementation(),
         RUNTIME_VERSION: platform.python_version(),
     }
 
 
+def _git_metadata_with_workspace(cwd):
+    # type: (Optional[str]) -> Dict[str, Optional[str]]
+    """Extract git metadata and the workspace path from the git repository in ``cwd``."""
+    git_info, workspace_path = git.extract_git_metadata_and_workspace(cwd=cwd)
+    if workspace_path is not None:
+        git_info[WORKSPACE_PATH] = workspace_path
+    return git_info
+
+
+_git_metadata_with_workspace_cached = cached(maxsize=8)(_git_metadata_with_workspace)
+
+
 def tags(env=None, cwd=None):
     # type: (Optional[MutableMapping[str, str]], Optional[str]) -> Dict[str, str]
     """Extract and set tags from provider environ, as well as git metadata."""
     env = os.environ if env is None else env
-    tags = {}  # type: Dict[str, Optional[str]]
-    for key, extract in PROVIDERS:
+    extract = None
+    for key, provider_extract in PROVIDERS:
         if key in env:
-            tags = extract(env)
+            extract = provider_extract
             break
 
-    git_info = git.extract_git_metadata(cwd=cwd)
-    try:
-        git_info[WORKSPACE_PATH] = git.extract_workspace_path(cwd=cwd)
-    except git.GitNotFoundError:
-        log.error("Git executable not found, cannot extract git metadata.")
-    except ValueError as e:
-        debug_mode = log.isEnabledFor(logging.DEBUG)
-        stderr = str(e)
-        log.error("Error extracting git metadata: %s", stderr, exc_info=debug_mode)
-
-    # Tags collected from CI provider take precedence over extracted git metadata, but any CI provider value
-    # is None or "" should be overwritten.
-    tags.update({k: v for k, v in git_info.items() if not tags.get(k)})
+    # The git state of a directory does not change while tests are running, so git metadata is only extracted
+    # once per directory unless caching is disabled.
+    if cwd is None:
+        try:
+            cwd = os.getcwd()
+        except OSError:
+            # The working directory no longer exists, let git report the error without caching it
+            pass
+    if cwd is None or asbool(os.environ.get("DD_CI_GIT_CACHE_DISABLE")):
+        git_info = _git_metadata_with_workspace(cwd)
+    else:
+        git_info = dict(_git_metadata_with_workspace_cached(cwd))
 
-    user_specified_git_info = git.extract_user_git_metadata(env)
+    if extract is None:
+        # Outside of a known CI provider, the extracted git metadata is all there is to start from.
+        tags = git_info
+    else:
+        tags = extract(env)
+        # Tags collected from CI provider take precedence over extracted git metadata, but any CI provider value
+        # is None or "" should be overwritten.
+        for k, v in git_info.items():
+            if not tags.get(k):
+                tags[k] = v
 
     # Tags provided by the user take precedence over everything
-    tags.update({k: v for k, v in user_specified_git_info.items() if v})
+    for k, v in git.extract_user_git_metadata(env).items():
+        if v:
+            tags[k] = v
 
     # if git.BRANCH is a tag, we associate its value to TAG instead of BRANCH
-    if git.is_ref_a_tag(tags.get(git.BRANCH)):
-        if not tags.get(git.TAG):
-            tags[git.TAG] = git.normalize_ref(tags.get(git.BRANCH))
-        else:
-            tags[git.TAG] = git.normalize_ref(tags.get(git.TAG))
+    branch = tags.get(git.BRANCH)
+    tag = tags.get(git.TAG)
+    if branch and git.is_ref_a_tag(branch):
+        tags[git.TAG] = git.normalize_ref(tag or branch)
         del tags[git.BRANCH]
     else:
-        tags[git.BRANCH] = git.normalize_ref(tags.get(git.BRANCH))
-        tags[git.TAG] = git.normalize_ref(tags.get(git.TAG))
+        if branch:
+            tags[git.BRANCH] = git.normalize_ref(branch)
+        if tag:
+            tags[git.TAG] = git.normalize_ref(tag)
 
-    tags[git.REPOSITORY_URL] = _filter_sensitive_info(tags.get(git.REPOSITORY_URL))
+    repository_url = tags.get(git.REPOSITORY_URL)
+    if repository_url:
+        tags[git.REPOSITORY_URL] = _filter_sensitive_info(repository_url)
 
     workspace_path = tags.get(WORKSPACE_PATH)
     if workspace_path:
@@ -136,17 +182,20 @@ def tags(env=None, cwd=None):
 
     tags.update(_get_runtime_and_os_metadata())
 
-    return {k: v for k, v in tags.items() if v is not None}
+    for k in [k for k, v in tags.items() if v is None]:
+        del tags[k]
+
+    return tags  # type: ignore[return-value]
 
 
 def extract_appveyor(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Appveyor environ."""
-    url = "https://ci.appveyor.com/project/{0}/builds/{1}".format(
-        env.get("APPVEYOR_REPO_NAME"), env.get("APPVEYOR_BUILD_ID")
-    )
+    repo_name = env.get("APPVEYOR_REPO_NAME")
+    build_id = env.get("APPVEYOR_BUILD_ID")
+    url = "https://ci.appveyor.com/project/{0}/builds/{1}".format(repo_name, build_id)
     if env.get("APPVEYOR_REPO_PROVIDER") == "github":
-        repository = "https://github.com/{0}.git".format(env.get("APPVEYOR_REPO_NAME"))  # type: Optional[str]
+        repository = "https://github.com/{0}.git".format(repo_name)  # type: Optional[str]
         commit = env.get("APPVEYOR_REPO_COMMIT")  # type: Optional[str]
         branch = env.get("APPVEYOR_PULL_REQUEST_HEAD_REPO_BRANCH") or env.get(
             "APPVEYOR_REPO_BRANCH"
@@ -166,8 +215,8 @@ def extract_appveyor(env):
         git.REPOSITORY_URL: repository,
         git.COMMIT_SHA: commit,
         WORKSPACE_PATH: env.get("APPVEYOR_BUILD_FOLDER"),
-        PIPELINE_ID: env.get("APPVEYOR_BUILD_ID"),
-        PIPELINE_NAME: env.get("APPVEYOR_REPO_NAME"),
+        PIPELINE_ID: build_id,
+        PIPELINE_NAME: repo_name,
         PIPELINE_NUMBER: env.get("APPVEYOR_BUILD_NUMBER"),
         PIPELINE_URL: url,
         JOB_URL: url,
@@ -182,13 +231,15 @@ def extract_appveyor(env):
 def extract_azure_pipelines(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Azure pipelines environ."""
-    if env.get("SYSTEM_TEAMFOUNDATIONSERVERURI") and env.get("SYSTEM_TEAMPROJECTID") and env.get("BUILD_BUILDID"):
-        base_url = "{0}{1}/_build/results?buildId={2}".format(
-            env.get("SYSTEM_TEAMFOUNDATIONSERVERURI"), env.get("SYSTEM_TEAMPROJECTID"), env.get("BUILD_BUILDID")
-        )
+    server_uri = env.get("SYSTEM_TEAMFOUNDATIONSERVERURI")
+    project_id = env.get("SYSTEM_TEAMPROJECTID")
+    build_id = env.get("BUILD_BUILDID")
+    job_id = env.get("SYSTEM_JOBID")
+    if server_uri and project_id and build_id:
+        base_url = "{0}{1}/_build/results?buildId={2}".format(server_uri, project_id, build_id)
         pipeline_url = base_url  # type: Optional[str]
         job_url = base_url + "&view=logs&j={0}&t={1}".format(
-            env.get("SYSTEM_JOBID"), env.get("SYSTEM_TASKINSTANCEID")
+            job_id, env.get("SYSTEM_TASKINSTANCEID")
         )  # type: Optional[str]
     else:
         pipeline_url = job_url = None
@@ -196,9 +247,9 @@ def extract_azure_pipelines(env):
     return {
         PROVIDER_NAME: "azurepipelines",
         WORKSPACE_PATH: env.get("BUILD_SOURCESDIRECTORY"),
-        PIPELINE_ID: env.get("BUILD_BUILDID"),
+        PIPELINE_ID: build_id,
         PIPELINE_NAME: env.get("BUILD_DEFINITIONNAME"),
-        PIPELINE_NUMBER: env.get("BUILD_BUILDID"),
+        PIPELINE_NUMBER: build_id,
         PIPELINE_URL: pipeline_url,
         JOB_URL: job_url,
         git.REPOSITORY_URL: env.get("SYSTEM_PULLREQUEST_SOURCEREPOSITORYURI") or env.get("BUILD_REPOSITORY_URI"),
@@ -211,16 +262,12 @@ def extract_azure_pipelines(env):
         git.COMMIT_AUTHOR_EMAIL: env.get("BUILD_REQUESTEDFOREMAIL"),
         STAGE_NAME: env.get("SYSTEM_STAGEDISPLAYNAME"),
         JOB_NAME: env.get("SYSTEM_JOBDISPLAYNAME"),
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(
-            OrderedDict(
-                [
-                    ("SYSTEM_TEAMPROJECTID", env.get("SYSTEM_TEAMPROJECTID")),
-                    ("BUILD_BUILDID", env.get("BUILD_BUILDID")),
-                    ("SYSTEM_JOBID", env.get("SYSTEM_JOBID")),
-                ]
-            ),
-            separators=(",", ":"),
+        _CI_ENV_VARS: _ci_env_vars_json(
+            (
+                ("SYSTEM_TEAMPROJECTID", project_id),
+                ("BUILD_BUILDID", build_id),
+                ("SYSTEM_JOBID", job_id),
+            )
         ),
     }
 
@@ -228,9 +275,9 @@ def extract_azure_pipelines(env):
 def extract_bitbucket(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Bitbucket environ."""
-    url = "https://bitbucket.org/{0}/addon/pipelines/home#!/results/{1}".format(
-        env.get("BITBUCKET_REPO_FULL_NAME"), env.get("BITBUCKET_BUILD_NUMBER")
-    )
+    repo_name = env.get("BITBUCKET_REPO_FULL_NAME")
+    build_number = env.get("BITBUCKET_BUILD_NUMBER")
+    url = "https://bitbucket.org/{0}/addon/pipelines/home#!/results/{1}".format(repo_name, build_number)
     return {
         git.BRANCH: env.get("BITBUCKET_BRANCH"),
         git.COMMIT_SHA: env.get("BITBUCKET_COMMIT"),
@@ -238,8 +285,8 @@ def extract_bitbucket(env):
         git.TAG: env.get("BITBUCKET_TAG"),
         JOB_URL: url,
         PIPELINE_ID: env.get("BITBUCKET_PIPELINE_UUID", "").strip("{}}") or None,
-        PIPELINE_NAME: env.get("BITBUCKET_REPO_FULL_NAME"),
-        PIPELINE_NUMBER: env.get("BITBUCKET_BUILD_NUMBER"),
+        PIPELINE_NAME: repo_name,
+        PIPELINE_NUMBER: build_number,
         PIPELINE_URL: url,
         PROVIDER_NAME: "bitbucket",
         WORKSPACE_PATH: env.get("BITBUCKET_CLONE_DIR"),
@@ -249,16 +296,19 @@ def extract_bitbucket(env):
 def extract_buildkite(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Buildkite environ."""
+    build_id = env.get("BUILDKITE_BUILD_ID")
+    build_url = env.get("BUILDKITE_BUILD_URL")
+    job_id = env.get("BUILDKITE_JOB_ID")
     return {
         git.BRANCH: env.get("BUILDKITE_BRANCH"),
         git.COMMIT_SHA: env.get("BUILDKITE_COMMIT"),
         git.REPOSITORY_URL: env.get("BUILDKITE_REPO"),
         git.TAG: env.get("BUILDKITE_TAG"),
-        PIPELINE_ID: env.get("BUILDKITE_BUILD_ID"),
+        PIPELINE_ID: build_id,
         PIPELINE_NAME: env.get("BUILDKITE_PIPELINE_SLUG"),
         PIPELINE_NUMBER: env.get("BUILDKITE_BUILD_NUMBER"),
-        PIPELINE_URL: env.get("BUILDKITE_BUILD_URL"),
-        JOB_URL: "{0}#{1}".format(env.get("BUILDKITE_BUILD_URL"), env.get("BUILDKITE_JOB_ID")),
+        PIPELINE_URL: build_url,
+        JOB_URL: "{0}#{1}".format(build_url, job_id),
         PROVIDER_NAME: "buildkite",
         WORKSPACE_PATH: env.get("BUILDKITE_BUILD_CHECKOUT_PATH"),
         git.COMMIT_MESSAGE: env.get("BUILDKITE_MESSAGE"),
@@ -266,15 +316,11 @@ def extract_buildkite(env):
         git.COMMIT_AUTHOR_EMAIL: env.get("BUILDKITE_BUILD_AUTHOR_EMAIL"),
         git.COMMIT_COMMITTER_NAME: env.get("BUILDKITE_BUILD_CREATOR"),
         git.COMMIT_COMMITTER_EMAIL: env.get("BUILDKITE_BUILD_CREATOR_EMAIL"),
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(
-            OrderedDict(
-                [
-                    ("BUILDKITE_BUILD_ID", env.get("BUILDKITE_BUILD_ID")),
-                    ("BUILDKITE_JOB_ID", env.get("BUILDKITE_JOB_ID")),
-                ]
-            ),
-            separators=(",", ":"),
+        _CI_ENV_VARS: _ci_env_vars_json(
+            (
+                ("BUILDKITE_BUILD_ID", build_id),
+                ("BUILDKITE_JOB_ID", job_id),
+            )
         ),
     }
 
@@ -282,28 +328,26 @@ def extract_buildkite(env):
 def extract_circle_ci(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from CircleCI environ."""
+    workflow_id = env.get("CIRCLE_WORKFLOW_ID")
+    build_num = env.get("CIRCLE_BUILD_NUM")
     return {
         git.BRANCH: env.get("CIRCLE_BRANCH"),
         git.COMMIT_SHA: env.get("CIRCLE_SHA1"),
         git.REPOSITORY_URL: env.get("CIRCLE_REPOSITORY_URL"),
         git.TAG: env.get("CIRCLE_TAG"),
-        PIPELINE_ID: env.get("CIRCLE_WORKFLOW_ID"),
+        PIPELINE_ID: workflow_id,
         PIPELINE_NAME: env.get("CIRCLE_PROJECT_REPONAME"),
-        PIPELINE_NUMBER: env.get("CIRCLE_BUILD_NUM"),
-        PIPELINE_URL: "https://app.circleci.com/pipelines/workflows/{0}".format(env.get("CIRCLE_WORKFLOW_ID")),
+        PIPELINE_NUMBER: build_num,
+        PIPELINE_URL: "https://app.circleci.com/pipelines/workflows/{0}".format(workflow_id),
         JOB_URL: env.get("CIRCLE_BUILD_URL"),
         JOB_NAME: env.get("CIRCLE_JOB"),
         PROVIDER_NAME: "circleci",
         WORKSPACE_PATH: env.get("CIRCLE_WORKING_DIRECTORY"),
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(
-            OrderedDict(
-                [
-                    ("CIRCLE_WORKFLOW_ID", env.get("CIRCLE_WORKFLOW_ID")),
-                    ("CIRCLE_BUILD_NUM", env.get("CIRCLE_BUILD_NUM")),
-                ]
-            ),
-            separators=(",", ":"),
+        _CI_ENV_VARS: _ci_env_vars_json(
+            (
+                ("CIRCLE_WORKFLOW_ID", workflow_id),
+                ("CIRCLE_BUILD_NUM", build_num),
+            )
         ),
     }
 
@@ -311,43 +355,37 @@ def extract_circle_ci(env):
 def extract_github_actions(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Github environ."""
-
-    pipeline_url = "{0}/{1}/actions/runs/{2}".format(
-        env.get("GITHUB_SERVER_URL"),
-        env.get("GITHUB_REPOSITORY"),
-        env.get("GITHUB_RUN_ID"),
-    )
+    server_url = env.get("GITHUB_SERVER_URL")
+    repository = env.get("GITHUB_REPOSITORY")
+    run_id = env.get("GITHUB_RUN_ID")
+    commit_sha = env.get("GITHUB_SHA")
     run_attempt = env.get("GITHUB_RUN_ATTEMPT")
+
+    pipeline_url = "{0}/{1}/actions/runs/{2}".format(server_url, repository, run_id)
     if run_attempt:
         pipeline_url = "{0}/attempts/{1}".format(pipeline_url, run_attempt)
 
-    # OrderedDict is necessary for comparing against a fixture in testing
-    env_vars = OrderedDict(
-        [
-            ("GITHUB_SERVER_URL", env.get("GITHUB_SERVER_URL")),
-            ("GITHUB_REPOSITORY", env.get("GITHUB_REPOSITORY")),
-            ("GITHUB_RUN_ID", env.get("GITHUB_RUN_ID")),
-        ]
-    )
-    if env.get("GITHUB_RUN_ATTEMPT") is not None:
-        env_vars["GITHUB_RUN_ATTEMPT"] = env["GITHUB_RUN_ATTEMPT"]
+    env_vars = [
+        ("GITHUB_SERVER_URL", server_url),
+        ("GITHUB_REPOSITORY", repository),
+        ("GITHUB_RUN_ID", run_id),
+    ]
+    if run_attempt is not None:
+        env_vars.append(("GITHUB_RUN_ATTEMPT", run_attempt))
 
     return {
         git.BRANCH: env.get("GITHUB_HEAD_REF") or env.get("GITHUB_REF"),
-        git.COMMIT_SHA: env.get("GITHUB_SHA"),
-        git.REPOSITORY_URL: "{0}/{1}.git".format(env.get("GITHUB_SERVER_URL"), env.get("GITHUB_REPOSITORY")),
-        JOB_URL: "{0}/{1}/commit/{2}/checks".format(
-            env.get("GITHUB_SERVER_URL"), env.get("GITHUB_REPOSITORY"), env.get("GITHUB_SHA")
-        ),
-        PIPELINE_ID: env.get("GITHUB_RUN_ID"),
+        git.COMMIT_SHA: commit_sha,
+        git.REPOSITORY_URL: "{0}/{1}.git".format(server_url, repository),
+        JOB_URL: "{0}/{1}/commit/{2}/checks".format(server_url, repository, commit_sha),
+        PIPELINE_ID: run_id,
         PIPELINE_NAME: env.get("GITHUB_WORKFLOW"),
         PIPELINE_NUMBER: env.get("GITHUB_RUN_NUMBER"),
         PIPELINE_URL: pipeline_url,
         JOB_NAME: env.get("GITHUB_JOB"),
         PROVIDER_NAME: "github",
         WORKSPACE_PATH: env.get("GITHUB_WORKSPACE"),
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(env_vars, separators=(",", ":")),
+        _CI_ENV_VARS: _ci_env_vars_json(env_vars),
     }
 
 
@@ -359,11 +397,15 @@ def extract_gitlab(env):
     author_email = None  # type: Optional[str]
     if author:
         # Extract name and email from `author` which is in the form "name <email>"
-        author_name, author_email = author.strip("> ").split(" <")
+        name_part, sep, email_part = author.rpartition(" <")
+        if sep:
+            author_name = name_part
+            author_email = email_part.rstrip("> ")
     commit_timestamp = env.get("CI_COMMIT_TIMESTAMP")
+    pipeline_id = env.get("CI_PIPELINE_ID")
     url = env.get("CI_PIPELINE_URL")
     if url:
-        url = re.sub("/-/pipelines/", "/pipelines/", url)
+        url = url.replace("/-/pipelines/", "/pipelines/")
     return {
         git.BRANCH: env.get("CI_COMMIT_REF_NAME"),
         git.COMMIT_SHA: env.get("CI_COMMIT_SHA"),
@@ -372,7 +414,7 @@ def extract_gitlab(env):
         STAGE_NAME: env.get("CI_JOB_STAGE"),
         JOB_NAME: env.get("CI_JOB_NAME"),
         JOB_URL: env.get("CI_JOB_URL"),
-        PIPELINE_ID: env.get("CI_PIPELINE_ID"),
+        PIPELINE_ID: pipeline_id,
         PIPELINE_NAME: env.get("CI_PROJECT_PATH"),
         PIPELINE_NUMBER: env.get("CI_PIPELINE_IID"),
         PIPELINE_URL: url,
@@ -382,16 +424,12 @@ def extract_gitlab(env):
         git.COMMIT_AUTHOR_NAME: author_name,
         git.COMMIT_AUTHOR_EMAIL: author_email,
         git.COMMIT_AUTHOR_DATE: commit_timestamp,
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(
-            OrderedDict(
-                [
-                    ("CI_PROJECT_URL", env.get("CI_PROJECT_URL")),
-                    ("CI_PIPELINE_ID", env.get("CI_PIPELINE_ID")),
-                    ("CI_JOB_ID", env.get("CI_JOB_ID")),
-                ]
-            ),
-            separators=(",", ":"),
+        _CI_ENV_VARS: _ci_env_vars_json(
+            (
+                ("CI_PROJECT_URL", env.get("CI_PROJECT_URL")),
+                ("CI_PIPELINE_ID", pipeline_id),
+                ("CI_JOB_ID", env.get("CI_JOB_ID")),
+            )
         ),
     }
 
@@ -402,9 +440,10 @@ def extract_jenkins(env):
     branch = env.get("GIT_BRANCH", "")
     name = env.get("JOB_NAME")
     if name and branch:
-        name = re.sub("/{0}".format(git.normalize_ref(branch)), "", name)
-    if name:
-        name = "/".join((v for v in name.split("/") if v and "=" not in v))
+        name = name.replace("/{0}".format(git.normalize_ref(branch)), "")
+    if name and ("/" in name or "=" in name):
+        # Drop empty segments and parameter segments like "KEY=VALUE" from the job name
+        name = "/".join([v for v in name.split("/") if v and "=" not in v])
 
     return {
         git.BRANCH: env.get("GIT_BRANCH"),
@@ -416,31 +455,21 @@ def extract_jenkins(env):
         PIPELINE_URL: env.get("BUILD_URL"),
         PROVIDER_NAME: "jenkins",
         WORKSPACE_PATH: env.get("WORKSPACE"),
-        # OrderedDict is necessary for comparing against a fixture in testing
-        _CI_ENV_VARS: json.dumps(
-            OrderedDict(
-                [
-                    ("DD_CUSTOM_TRACE_ID", env.get("DD_CUSTOM_TRACE_ID")),
-                ]
-            ),
-            separators=(",", ":"),
-        ),
+        _CI_ENV_VARS: _ci_env_vars_json((("DD_CUSTOM_TRACE_ID", env.get("DD_CUSTOM_TRACE_ID")),)),
     }
 
 
 def extract_teamcity(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Teamcity environ."""
+    server_url = env.get("SERVER_URL")
+    build_id = env.get("BUILD_ID")
     return {
         git.COMMIT_SHA: env.get("BUILD_VCS_NUMBER"),
         git.REPOSITORY_URL: env.get("BUILD_VCS_URL"),
-        PIPELINE_ID: env.get("BUILD_ID"),
+        PIPELINE_ID: build_id,
         PIPELINE_NUMBER: env.get("BUILD_NUMBER"),
-        PIPELINE_URL: (
-            "{0}/viewLog.html?buildId={1}".format(env.get("SERVER_URL"), env.get("BUILD_ID"))
-            if env.get("SERVER_URL") and env.get("BUILD_ID")
-            else None
-        ),
+        PIPELINE_URL: "{0}/viewLog.html?buildId={1}".format(server_url, build_id) if server_url and build_id else None,
         PROVIDER_NAME: "teamcity",
         WORKSPACE_PATH: env.get("BUILD_CHECKOUTDIR"),
     }
@@ -449,14 +478,15 @@ def extract_teamcity(env):
 def extract_travis(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Travis environ."""
+    repo_slug = env.get("TRAVIS_REPO_SLUG")
     return {
         git.BRANCH: env.get("TRAVIS_PULL_REQUEST_BRANCH") or env.get("TRAVIS_BRANCH"),
         git.COMMIT_SHA: env.get("TRAVIS_COMMIT"),
-        git.REPOSITORY_URL: "https://github.com/{0}.git".format(env.get("TRAVIS_REPO_SLUG")),
+        git.REPOSITORY_URL: "https://github.com/{0}.git".format(repo_slug),
         git.TAG: env.get("TRAVIS_TAG"),
         JOB_URL: env.get("TRAVIS_JOB_WEB_URL"),
         PIPELINE_ID: env.get("TRAVIS_BUILD_ID"),
-        PIPELINE_NAME: env.get("TRAVIS_REPO_SLUG"),
+        PIPELINE_NAME: repo_slug,
         PIPELINE_NUMBER: env.get("TRAVIS_BUILD_NUMBER"),
         PIPELINE_URL: env.get("TRAVIS_BUILD_WEB_URL"),
         PROVIDER_NAME: "travisci",
@@ -470,14 +500,14 @@ def extract_bitrise(env):
     """Extract CI tags from Bitrise environ."""
     commit = env.get("BITRISE_GIT_COMMIT") or env.get("GIT_CLONE_COMMIT_HASH")
     branch = env.get("BITRISEIO_GIT_BRANCH_DEST") or env.get("BITRISE_GIT_BRANCH")
-    if env.get("BITRISE_GIT_MESSAGE"):
-        message = env.get("BITRISE_GIT_MESSAGE")  # type: Optional[str]
-    elif env.get("GIT_CLONE_COMMIT_MESSAGE_SUBJECT") or env.get("GIT_CLONE_COMMIT_MESSAGE_BODY"):
-        message = "{0}:\n{1}".format(
-            env.get("GIT_CLONE_COMMIT_MESSAGE_SUBJECT"), env.get("GIT_CLONE_COMMIT_MESSAGE_BODY")
-        )
-    else:
-        message = None
+    message = env.get("BITRISE_GIT_MESSAGE")
+    if not message:
+        message_subject = env.get("GIT_CLONE_COMMIT_MESSAGE_SUBJECT")
+        message_body = env.get("GIT_CLONE_COMMIT_MESSAGE_BODY")
+        if message_subject or message_body:
+            message = "{0}:\n{1}".format(message_subject, message_body)
+        else:
+            message = None
 
     return {
         PROVIDER_NAME: "bitrise",
@@ -501,11 +531,12 @@ def extract_bitrise(env):
 def extract_buddy(env):
     # type: (MutableMapping[str, str]) -> Dict[str, Optional[str]]
     """Extract CI tags from Buddy environ."""
+    execution_id = env.get("BUDDY_EXECUTION_ID")
     return {
         PROVIDER_NAME: "buddy",
-        PIPELINE_ID: "{0}/{1}".format(env.get("BUDDY_PIPELINE_ID"), env.get("BUDDY_EXECUTION_ID")),
+        PIPELINE_ID: "{0}/{1}".format(env.get("BUDDY_PIPELINE_ID"), execution_id),
         PIPELINE_NAME: env.get("BUDDY_PIPELINE_NAME"),
-        PIPELINE_NUMBER: env.get("BUDDY_EXECUTION_ID"),
+        PIPELINE_NUMBER: execution_id,
         PIPELINE_URL: env.get("BUDDY_EXECUTION_URL"),
         git.REPOSITORY_URL: env.get("BUDDY_SCM_URL"),
         git.COMMIT_SHA: env.get("BUDDY_EXECUTION_REVISION"),
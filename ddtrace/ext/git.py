@@ -132,10 +132,36 @@ def extract_commit_sha(cwd=None):
     return commit_sha
 
 
-def extract_git_metadata(cwd=None):
-    # type: (Optional[str]) -> Dict[str, Optional[str]]
-    """Extract git commit metadata."""
+def extract_branch_and_commit_sha(cwd=None):
+    # type: (Optional[str]) -> Tuple[str, str]
+    """Extract git branch and commit SHA with a single git invocation."""
+    stdout = _git_subprocess_cmd("rev-parse HEAD --abbrev-ref HEAD", cwd=cwd)
+    commit_sha, branch = stdout.splitlines()
+    return branch, commit_sha
+
+
+def extract_workspace_path_branch_and_commit_sha(cwd=None):
+    # type: (Optional[str]) -> Tuple[str, str, str]
+    """Extract the root directory path, git branch and commit SHA with a single git invocation."""
+    stdout = _git_subprocess_cmd("rev-parse --show-toplevel HEAD --abbrev-ref HEAD", cwd=cwd)
+    workspace_path, commit_sha, branch = stdout.splitlines()
+    return workspace_path, branch, commit_sha
+
+
+def _log_git_error(e):
+    # type: (Exception) -> None
+    if isinstance(e, GitNotFoundError):
+        log.error("Git executable not found, cannot extract git metadata.")
+    else:
+        debug_mode = log.isEnabledFor(logging.DEBUG)
+        stderr = str(e)
+        log.error("Error extracting git metadata: %s", stderr, exc_info=debug_mode)
+
+
+def _extract_git_metadata(cwd, with_workspace_path):
+    # type: (Optional[str], bool) -> Tuple[Dict[str, Optional[str]], Optional[str]]
     tags = {}  # type: Dict[str, Optional[str]]
+    workspace_path = None  # type: Optional[str]
     try:
         tags[REPOSITORY_URL] = extract_repository_url(cwd=cwd)
         tags[COMMIT_MESSAGE] = extract_commit_message(cwd=cwd)
@@ -146,16 +172,41 @@ def extract_git_metadata(cwd=None):
         tags[COMMIT_COMMITTER_NAME] = users["committer"][0]
         tags[COMMIT_COMMITTER_EMAIL] = users["committer"][1]
         tags[COMMIT_COMMITTER_DATE] = users["committer"][2]
-        tags[BRANCH] = extract_branch(cwd=cwd)
-        tags[COMMIT_SHA] = extract_commit_sha(cwd=cwd)
-    except GitNotFoundError:
-        log.error("Git executable not found, cannot extract git metadata.")
-    except ValueError as e:
-        debug_mode = log.isEnabledFor(logging.DEBUG)
-        stderr = str(e)
-        log.error("Error extracting git metadata: %s", stderr, exc_info=debug_mode)
+        if with_workspace_path:
+            try:
+                workspace_path, tags[BRANCH], tags[COMMIT_SHA] = extract_workspace_path_branch_and_commit_sha(cwd=cwd)
+            except ValueError:
+                # --show-toplevel fails outside of a work tree (e.g. in the .git directory), but branch and commit
+                # SHA can still be extracted
+                tags[BRANCH], tags[COMMIT_SHA] = extract_branch_and_commit_sha(cwd=cwd)
+        else:
+            tags[BRANCH], tags[COMMIT_SHA] = extract_branch_and_commit_sha(cwd=cwd)
+    except (GitNotFoundError, ValueError) as e:
+        _log_git_error(e)
+
+    if with_workspace_path and workspace_path is None:
+        # The combined extraction did not run or failed, but the workspace path might still be available.
+        try:
+            workspace_path = extract_workspace_path(cwd=cwd)
+        except (GitNotFoundError, ValueError) as e:
+            _log_git_error(e)
+
+    return tags, workspace_path
 
-    return tags
+
+def extract_git_metadata(cwd=None):
+    # type: (Optional[str]) -> Dict[str, Optional[str]]
+    """Extract git commit metadata."""
+    return _extract_git_metadata(cwd, with_workspace_path=False)[0]
+
+
+def extract_git_metadata_and_workspace(cwd=None):
+    # type: (Optional[str]) -> Tuple[Dict[str, Optional[str]], Optional[str]]
+    """Extract git commit metadata along with the root directory path of the repository.
+
+    The root directory path is ``None`` if it could not be extracted.
+    """
+    return _extract_git_metadata(cwd, with_workspace_path=True)
 
 
 def extract_user_git_metadata(env=None):
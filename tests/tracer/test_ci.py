@@ -1,6 +1,7 @@
 import glob
 import json
 import os
+import platform
 import subprocess
 
 import mock
@@ -124,6 +125,40 @@ def test_git_extract_workspace_path_error(tmpdir):
         git.extract_workspace_path(cwd=str(tmpdir))
 
 
+def test_git_extract_workspace_path_branch_and_commit_sha(git_repo):
+    """Make sure that workspace path, branch and commit SHA are extracted from a single git invocation."""
+    with mock.patch("ddtrace.ext.ci.git.subprocess.Popen", wraps=subprocess.Popen) as mock_popen:
+        workspace_path, branch, commit_sha = git.extract_workspace_path_branch_and_commit_sha(cwd=git_repo)
+    assert mock_popen.call_count == 1
+
+    assert workspace_path == git_repo
+    assert branch == "master"
+    assert commit_sha == git.extract_commit_sha(cwd=git_repo)
+
+
+def test_extract_git_metadata_and_workspace_error(git_repo_empty):
+    """On error, the workspace path should still be extracted if available."""
+    _, workspace_path = git.extract_git_metadata_and_workspace(cwd=git_repo_empty)
+    assert workspace_path == git_repo_empty
+
+    assert ci.tags(env={}, cwd=git_repo_empty)["ci.workspace_path"] == git_repo_empty
+
+
+def test_extract_git_metadata_outside_work_tree(git_repo):
+    """Branch and commit SHA should be extracted even where the root directory path cannot be."""
+    git_dir = os.path.join(git_repo, ".git")
+    commit_sha = git.extract_commit_sha(cwd=git_repo)
+
+    extracted_tags = git.extract_git_metadata(cwd=git_dir)
+    assert extracted_tags["git.branch"] == "master"
+    assert extracted_tags["git.commit.sha"] == commit_sha
+
+    extracted_tags, workspace_path = git.extract_git_metadata_and_workspace(cwd=git_dir)
+    assert workspace_path is None
+    assert extracted_tags["git.branch"] == "master"
+    assert extracted_tags["git.commit.sha"] == commit_sha
+
+
 def test_extract_git_metadata(git_repo):
     """Test that extract_git_metadata() sets all tags correctly."""
     extracted_tags = git.extract_git_metadata(cwd=git_repo)
@@ -256,3 +291,93 @@ def test_os_runtime_metadata_tagging():
     assert extracted_tags.get(ci.OS_VERSION) is not None
     assert extracted_tags.get(ci.RUNTIME_NAME) is not None
     assert extracted_tags.get(ci.RUNTIME_VERSION) is not None
+
+
+@pytest.mark.skipif(os.name != "posix", reason="os.uname() is only used on POSIX")
+def test_os_metadata_matches_platform():
+    """The OS metadata read from os.uname() should match the platform helpers."""
+    os_runtime_tags = ci._get_runtime_and_os_metadata()
+    assert os_runtime_tags[ci.OS_PLATFORM] == platform.system()
+    assert os_runtime_tags[ci.OS_VERSION] == platform.release()
+    assert os_runtime_tags[ci.OS_ARCHITECTURE] == platform.machine()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="os.uname() is only available on POSIX")
+def test_os_runtime_metadata_computed_once():
+    """Ensure that OS and runtime metadata are only extracted once per process."""
+    os_runtime_tags = ci._get_runtime_and_os_metadata()
+    with mock.patch("ddtrace.ext.ci.os.uname", side_effect=AssertionError("os.uname() called again")) as mock_uname:
+        with mock.patch("ddtrace.ext.ci.platform") as mock_platform:
+            assert ci._get_runtime_and_os_metadata() is os_runtime_tags
+    mock_uname.assert_not_called()
+    assert mock_platform.mock_calls == []
+
+
+def test_git_metadata_cached_per_cwd(git_repo):
+    """Git metadata should only be extracted once for a given directory."""
+    ci.tags(env={}, cwd=git_repo)
+    with mock.patch("ddtrace.ext.ci.git.subprocess.Popen") as mock_popen:
+        extracted_tags = ci.tags(env={}, cwd=git_repo)
+    mock_popen.assert_not_called()
+
+    assert extracted_tags["git.commit.message"] == "this is a commit msg"
+    assert extracted_tags["ci.workspace_path"] == git_repo
+
+
+def test_git_metadata_cache_disabled(git_repo, monkeypatch):
+    """Git metadata should be extracted on every call when DD_CI_GIT_CACHE_DISABLE is set in the process environ."""
+    ci.tags(env={}, cwd=git_repo)
+    monkeypatch.setenv("DD_CI_GIT_CACHE_DISABLE", "true")
+    with mock.patch("ddtrace.ext.ci.git.subprocess.Popen", wraps=subprocess.Popen) as mock_popen:
+        extracted_tags = ci.tags(env={}, cwd=git_repo)
+    assert mock_popen.called
+
+    assert extracted_tags["git.commit.message"] == "this is a commit msg"
+
+
+def test_jenkins_pipeline_name_branch_with_special_characters():
+    """Branch names are removed from the Jenkins job name literally, not as regular expressions."""
+    env = {"JENKINS_URL": "jenkins", "JOB_NAME": "jobName/feature+(1.0)", "GIT_BRANCH": "origin/feature+(1.0)"}
+    assert ci.extract_jenkins(env)[ci.PIPELINE_NAME] == "jobName"
+
+
+def test_ci_env_vars_json():
+    """CI env vars are serialized to compact JSON in the given order, with escaped values."""
+    env_vars = (("B_VAR", 'quote " and \\ backslash'), ("A_VAR", None))
+    assert ci._ci_env_vars_json(env_vars) == '{"B_VAR":"quote \\" and \\\\ backslash","A_VAR":null}'
+
+
+def test_tags_reflect_process_environ_changes(git_repo, monkeypatch):
+    """Tags extracted from the process environ should reflect its current values."""
+    monkeypatch.setenv("DD_GIT_BRANCH", "first")
+    assert ci.tags(cwd=git_repo)["git.branch"] == "first"
+
+    monkeypatch.setenv("DD_GIT_BRANCH", "second")
+    assert ci.tags(cwd=git_repo)["git.branch"] == "second"
+
+
+@pytest.mark.parametrize(
+    "author,expected_name,expected_email",
+    [
+        ("John Doe <john@doe.com>", "John Doe", "john@doe.com"),
+        ("John <Doe> <john@doe.com>", "John <Doe>", "john@doe.com"),
+        ("John Doe", None, None),
+    ],
+)
+def test_gitlab_commit_author(author, expected_name, expected_email):
+    """GitLab commit author name and email are extracted from the "name <email>" format."""
+    extracted_tags = ci.extract_gitlab({"GITLAB_CI": "gitlab", "CI_COMMIT_AUTHOR": author})
+    assert extracted_tags[git.COMMIT_AUTHOR_NAME] == expected_name
+    assert extracted_tags[git.COMMIT_AUTHOR_EMAIL] == expected_email
+
+
+def test_tags_deleted_working_directory(tmpdir, monkeypatch):
+    """If the working directory no longer exists, git metadata is skipped but OS and runtime tags are returned."""
+    cwd = tmpdir.mkdir("deleted")
+    monkeypatch.chdir(str(cwd))
+    cwd.remove()
+
+    extracted_tags = ci.tags(env={})
+    assert extracted_tags.get(ci.OS_PLATFORM) is not None
+    assert extracted_tags.get(ci.RUNTIME_NAME) is not None
+    assert git.COMMIT_SHA not in extracted_tags